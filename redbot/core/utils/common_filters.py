@@ -7,6 +7,7 @@ __all__ = [
     "filter_urls",
     "filter_invites",
     "filter_mass_mentions",
+    "filter_message_content",
     "filter_various_mentions",
     "normalize_smartquotes",
     "escape_spoilers",
@@ -35,6 +36,46 @@ SPOILER_CONTENT_RE = re.compile(
     r"(?s)(?<!\\)(?P<OPEN>\|{2})(?P<SPOILERED>.*?)(?<!\\)(?P<CLOSE>\|{2})"
 )
 
+# Single-pass machinery for `filter_message_content`: the selected filters
+# are fused into one alternation so the content is scanned once instead of
+# once per filter. The branches mirror URL_RE, INVITE_URL_RE and
+# MASS_MENTION_RE above, with the case-insensitivity scoped per branch.
+_FUSED_FILTER_SOURCES = {
+    "invite": r"(?i:(?:discord.gg|discordapp.com/invite|discord.me)\S+)",
+    "url": r"(?i:(?:https?|s?ftp)://\S+)",
+    "mass": r"@(?=everyone|here)",
+}
+
+_FUSED_FILTER_REPLACEMENTS = {
+    "invite": "[SANITIZED INVITE]",
+    "url": "[SANITIZED URL]",
+    "mass": "@\u200b",
+}
+
+_fused_filter_cache = {}
+
+
+def _fused_filter_re(mass_mentions: bool, invites: bool, urls: bool):
+    key = (mass_mentions, invites, urls)
+    try:
+        return _fused_filter_cache[key]
+    except KeyError:
+        parts = []
+        # invites before urls, so a linked invite is reported as an invite
+        if invites:
+            parts.append(f"(?P<invite>{_FUSED_FILTER_SOURCES['invite']})")
+        if urls:
+            parts.append(f"(?P<url>{_FUSED_FILTER_SOURCES['url']})")
+        if mass_mentions:
+            parts.append(f"(?P<mass>{_FUSED_FILTER_SOURCES['mass']})")
+        pattern = re.compile("|".join(parts)) if parts else None
+        _fused_filter_cache[key] = pattern
+        return pattern
+
+
+def _fused_filter_replacement(match) -> str:
+    return _FUSED_FILTER_REPLACEMENTS[match.lastgroup]
+
 
 # convenience wrappers
 def filter_urls(to_filter: str) -> str:
@@ -100,6 +141,37 @@ def filter_mass_mentions(to_filter: str) -> str:
     return MASS_MENTION_RE.sub("@\u200b", to_filter)
 
 
+def filter_message_content(
+    to_filter: str, *, mass_mentions: bool = True, invites: bool = True, urls: bool = False
+) -> str:
+    """Get a string with the selected filters applied in a single pass.
+
+    This gives the same result as chaining `filter_mass_mentions`,
+    `filter_invites` and `filter_urls`, but only scans the content once.
+
+    Parameters
+    ----------
+    to_filter : str
+        The string to filter.
+    mass_mentions : bool
+        Whether to sanitize mass mentions.
+    invites : bool
+        Whether to sanitize discord invites.
+    urls : bool
+        Whether to sanitize URLs.
+
+    Returns
+    -------
+    str
+        The sanitized string.
+
+    """
+    pattern = _fused_filter_re(mass_mentions, invites, urls)
+    if pattern is None:
+        return to_filter
+    return pattern.sub(_fused_filter_replacement, to_filter)
+
+
 def filter_various_mentions(to_filter: str) -> str:
     """
     Get a string with role, user, and channel mentions sanitized.